@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 import json
-from .models import Prompt, Aigent, ChatHistory
+from .models import Prompt, Aigent, ChatHistory, invalidate_active_aigent_cache
 
 @admin.register(Prompt)
 class PromptAdmin(admin.ModelAdmin):
@@ -45,6 +45,12 @@ class AigentAdmin(admin.ModelAdmin):
         }),
     )
 
+    def delete_queryset(self, request, queryset):
+        # "Delete selected" goes through QuerySet.delete(); don't rely on
+        # per-row signals alone to drop the cached active aigent.
+        super().delete_queryset(request, queryset)
+        invalidate_active_aigent_cache()
+
 
 @admin.register(ChatHistory)
 class ChatHistoryAdmin(admin.ModelAdmin):
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AigentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'aigents'
+
+    def ready(self):
+        from . import signals  # noqa: F401  (connects the active-aigent cache invalidation receivers)
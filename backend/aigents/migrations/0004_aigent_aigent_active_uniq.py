@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aigents', '0003_aigent_tools'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='aigent',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('is_active',), name='aigent_active_uniq'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-16 11:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aigents', '0004_aigent_aigent_active_uniq'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='chathistory',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='chathistory',
+            constraint=models.UniqueConstraint(fields=('user', 'aigent'), name='uniq_user_aigent_history'),
+        ),
+    ]
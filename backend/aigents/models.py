@@ -1,4 +1,8 @@
 # backend/aigents/models.py
+from functools import cached_property
+
+import orjson
+from django.core.cache import cache
 from django.db import models
 from django.conf import settings
 # Import the Tool model
@@ -86,14 +90,52 @@ class Aigent(models.Model):
     request_timeout_seconds = models.IntegerField(default=60, help_text="Timeout in seconds for requests to the Ollama server.")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # Partial unique index: at most one active Aigent, and the
+            # is_active=True lookup becomes a single-row index fetch.
+            models.UniqueConstraint(fields=['is_active'], condition=models.Q(is_active=True), name='aigent_active_uniq'),
+        ]
     
     def __str__(self):
         return self.name
 
+    @cached_property
+    def aigent_state_json(self):
+        """Compact JSON encoding of aigent_state for prompt embedding. Reset on save()."""
+        return orjson.dumps(self.aigent_state if isinstance(self.aigent_state, dict) else {}).decode()
+
     def save(self, *args, **kwargs):
-        if self.is_active:
+        # The active-aigent cache is invalidated by aigents.signals.
+        update_fields = kwargs.get('update_fields')
+        if self.is_active and (update_fields is None or 'is_active' in update_fields):
             Aigent.objects.filter(is_active=True).exclude(pk=self.pk).update(is_active=False)
         super().save(*args, **kwargs)
+        self.__dict__.pop('aigent_state_json', None)
+
+
+ACTIVE_AIGENT_CACHE_KEY = 'active_aigent'
+ACTIVE_AIGENT_CACHE_TIMEOUT = 3600
+# What get_active_aigent() caches besides the pk; saving either invalidates it.
+# Bulk QuerySet.update() sends no signal, so callers that update these in bulk
+# must call invalidate_active_aigent_cache() themselves.
+ACTIVE_AIGENT_CACHED_FIELDS = frozenset({'is_active', 'name'})
+
+def get_active_aigent():
+    """
+    Returns the active Aigent (only 'id' and 'name' loaded), served from the
+    cache when possible. Returns None if no Aigent is active.
+    """
+    aigent = cache.get(ACTIVE_AIGENT_CACHE_KEY)
+    if aigent is None:
+        aigent = Aigent.objects.only('id', 'name').filter(is_active=True).first()
+        if aigent is not None:
+            cache.set(ACTIVE_AIGENT_CACHE_KEY, aigent, ACTIVE_AIGENT_CACHE_TIMEOUT)
+    return aigent
+
+def invalidate_active_aigent_cache():
+    cache.delete(ACTIVE_AIGENT_CACHE_KEY)
 
 
 class ChatHistory(models.Model):
@@ -104,10 +146,13 @@ class ChatHistory(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     class Meta:
         verbose_name_plural = "Chat Histories"
-        unique_together = ('user', 'aigent')
+        constraints = [
+            # Also serves as the (user, aigent) index every chat request filters on.
+            models.UniqueConstraint(fields=['user', 'aigent'], name='uniq_user_aigent_history'),
+        ]
     def __str__(self):
         return f"Chat history for {self.user.username} with {self.aigent.name}"
-    def add_message(self, role: str, content: str, timestamp: str):
+    def add_message(self, role: str, content: str, timestamp: int):
         if not isinstance(self.history, list): self.history = []
         self.history.append({"role": role, "content": content, "timestamp": timestamp})
         self.save()
\ No newline at end of file
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ACTIVE_AIGENT_CACHED_FIELDS, Aigent, invalidate_active_aigent_cache
+
+
+@receiver(post_save, sender=Aigent)
+def aigent_saved(sender, instance, update_fields=None, **kwargs):
+    # Saves that leave is_active and name alone (e.g. the chat task's
+    # per-turn update_fields=['aigent_state']) keep the cached active aigent valid.
+    if update_fields is None or not ACTIVE_AIGENT_CACHED_FIELDS.isdisjoint(update_fields):
+        invalidate_active_aigent_cache()
+
+
+@receiver(post_delete, sender=Aigent)
+def aigent_deleted(sender, instance, **kwargs):
+    # Also sent per row by QuerySet.delete(), including the admin's "delete selected".
+    invalidate_active_aigent_cache()
@@ -0,0 +1,88 @@
+# backend/aigents/streaming.py
+import asyncio
+import logging
+import weakref
+
+import orjson
+import redis
+import redis.asyncio
+from celery import states
+from django.conf import settings
+
+app_logger = logging.getLogger('aigents')
+
+# How long a client may wait on the task events stream before falling back to polling.
+TASK_EVENTS_TIMEOUT_SECONDS = 300
+TASK_EVENTS_KEEPALIVE_SECONDS = 15
+
+_redis_client = None
+
+def get_redis() -> redis.Redis:
+    """Returns a process-wide Redis client (connection-pooled) for pub/sub."""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+# One async client (and connection pool) per event loop; in the ASGI server that
+# is one per process. Pooled connections are bound to the loop that opened them.
+_async_redis_clients = weakref.WeakKeyDictionary()
+
+def get_async_redis() -> redis.asyncio.Redis:
+    """Returns the connection-pooled async Redis client for the running loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_redis_clients.get(loop)
+    if client is None:
+        client = _async_redis_clients[loop] = redis.asyncio.Redis.from_url(settings.REDIS_URL)
+    return client
+
+def task_results_channel(user_id: int, task_id: str) -> str:
+    """The pub/sub channel carrying the final status of one of a user's tasks."""
+    return f"task-results:{user_id}:{task_id}"
+
+def publish_task_result(user_id: int, payload: dict) -> None:
+    """
+    Publishes a task's final status payload to that task's results channel.
+    Best-effort: the result backend remains the source of truth.
+    """
+    try:
+        get_redis().publish(task_results_channel(user_id, payload["task_id"]), orjson.dumps(payload))
+    except redis.RedisError as e:
+        app_logger.warning(f"Could not publish result for task {payload.get('task_id')}: {e}")
+
+def _sse_event(payload: dict) -> bytes:
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+async def stream_task_result(user_id: int, task_id: str, get_status_payload):
+    """
+    Async generator of Server-Sent Events for a single task. Subscribes to the
+    task's results channel, then checks the result backend once (via the
+    get_status_payload coroutine function) in case the task finished before
+    the subscription. Yields one 'data' event with the final status, sending
+    keepalive comments while waiting. If the timeout is reached, it yields the
+    current (non-final) status so the client can fall back to polling.
+    """
+    pubsub = get_async_redis().pubsub(ignore_subscribe_messages=True)
+    try:
+        await pubsub.subscribe(task_results_channel(user_id, task_id))
+
+        payload = await get_status_payload(task_id)
+        if payload["status"] in states.READY_STATES:
+            yield _sse_event(payload)
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + TASK_EVENTS_TIMEOUT_SECONDS
+        while loop.time() < deadline:
+            message = await pubsub.get_message(timeout=TASK_EVENTS_KEEPALIVE_SECONDS)
+            if message is None:
+                yield b": keepalive\n\n"
+                continue
+            # The channel only carries this task's final status, already JSON-encoded.
+            yield b"data: " + message["data"] + b"\n\n"
+            return
+
+        yield _sse_event(await get_status_payload(task_id))
+    finally:
+        # Returns the pub/sub connection to the shared pool.
+        await pubsub.aclose()
@@ -1,23 +1,36 @@
 # backend/aigents/tasks.py
-import asyncio
 import httpx
 import json
 import logging
 import re
+import time
 from datetime import datetime, timezone
 import inspect
 
-from celery import shared_task
+import msgspec
+import orjson
+from celery import Task, shared_task, states
 from .models import Aigent, Prompt, ChatHistory
+from .streaming import publish_task_result
 from tools.models import Tool 
 from tools import executor as tool_executor 
 from django.contrib.auth import get_user_model
+from django.db.models import JSONField
+from django.db.models.expressions import RawSQL
 from typing import List
 
 User = get_user_model()
 app_logger = logging.getLogger('aigents')
 llm_logger = logging.getLogger('llm_logger')
 
+# --- Structured LLM Output ---
+class LLMOutput(msgspec.Struct):
+    """The final structured JSON response expected from the LLM."""
+    answer_to_user: str
+    updated_aigent_state: dict
+    updated_user_state: dict
+
+
 # --- Data Sanitization Helper ---
 def _sanitize_calendar_events(events_list: list) -> list:
     """
@@ -103,14 +116,39 @@ def extract_json_from_text(text: str) -> str:
     return text
 
 async def make_ollama_request(url, payload, timeout):
+    """
+    Streams a generate request from Ollama, so the timeout applies between
+    chunks rather than to the whole generation. Returns the final chunk with
+    the accumulated text under "response", i.e. the same shape as a
+    non-streaming response.
+    """
+    parts = []
+    final_chunk = {}
     async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.post(url, json=payload)
-        response.raise_for_status()
-        return response.json()
+        async with client.stream("POST", url, content=orjson.dumps(payload), headers={"Content-Type": "application/json"}) as response:
+            if response.is_error:
+                await response.aread() # So error handlers can read response.text
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                if "error" in chunk:
+                    raise ValueError(f"Ollama returned an error mid-stream: {chunk['error']}")
+                delta = chunk.get("response", "")
+                if delta:
+                    parts.append(delta)
+                if chunk.get("done"):
+                    final_chunk = chunk
+                    break
+    final_chunk["response"] = "".join(parts)
+    return final_chunk
 
 def get_required_objects_wrapper(user_id: int):
     try:
-        user = User.objects.get(pk=user_id)
+        # Only what the task reads (prompt state and timezone); the rest of the
+        # auth row (password hash, names, ...) is never needed here.
+        user = User.objects.only('id', 'username', 'user_state', 'timezone').get(pk=user_id)
     except User.DoesNotExist:
         app_logger.error(f"User with id {user_id} not found.")
         raise
@@ -128,19 +166,29 @@ def get_required_objects_wrapper(user_id: int):
     return active_aigent, user, prompt_template_obj
 
 def serialize_user_state_wrapper(user_instance):
-    return json.dumps(user_instance.user_state, indent=2) if isinstance(user_instance.user_state, dict) else json.dumps({})
+    return user_instance.user_state_json
 
 def serialize_aigent_state_wrapper(aigent_instance):
-    return json.dumps(aigent_instance.aigent_state, indent=2) if isinstance(aigent_instance.aigent_state, dict) else json.dumps({})
+    return aigent_instance.aigent_state_json
+
+HISTORY_TAIL_SQL = (
+    "CASE WHEN jsonb_typeof(history) = 'array' "
+    "THEN jsonb_path_query_array(history, '$[last - $n + 1 to last]', jsonb_build_object('n', %s)) "
+    "END"
+)
 
 def get_formatted_chat_history_wrapper(user_instance, aigent_instance, limit=10):
     try:
-        chat_history_obj = ChatHistory.objects.get(user=user_instance, aigent=aigent_instance)
-        history_list = chat_history_obj.history[-limit*2:] if isinstance(chat_history_obj.history, list) else []
+        # Only the last limit*2 entries leave Postgres (lax jsonpath clips the
+        # range for shorter histories); no ChatHistory instance is built.
+        history_tail = ChatHistory.objects.filter(
+            user_id=user_instance.id, aigent_id=aigent_instance.id
+        ).annotate(
+            tail=RawSQL(HISTORY_TAIL_SQL, [limit * 2], output_field=JSONField())
+        ).values_list('tail', flat=True).first()
+        history_list = history_tail if isinstance(history_tail, list) else []
         formatted_history = [f"{entry.get('role', 'unknown').capitalize()}: {entry.get('content', '')}" for entry in history_list]
         return "\n".join(formatted_history) if formatted_history else "No previous conversation history."
-    except ChatHistory.DoesNotExist:
-        return "No previous conversation history."
     except Exception as e:
         app_logger.error(f"Error formatting chat history: {str(e)}")
         return "Error retrieving conversation history."
@@ -148,7 +196,8 @@ def get_formatted_chat_history_wrapper(user_instance, aigent_instance, limit=10)
 def update_chat_history_wrapper(user, aigent, user_message_content, answer_to_user):
     history_obj, _ = ChatHistory.objects.get_or_create(user=user, aigent=aigent, defaults={'history': []})
     if not isinstance(history_obj.history, list): history_obj.history = []
-    timestamp = datetime.utcnow().isoformat() + "Z"
+    # Epoch milliseconds (UTC); formatted to ISO 8601 only when rendered by the API.
+    timestamp = time.time_ns() // 1_000_000
     history_obj.history.extend([
         {"role": "user", "content": user_message_content, "timestamp": timestamp},
         {"role": "assistant", "content": answer_to_user, "timestamp": timestamp}
@@ -165,11 +214,10 @@ def update_states_wrapper(user, aigent, new_user_state, new_aigent_state):
             if 'calendar_events' in new_user_state:
                 new_user_state['calendar_events'] = _sanitize_calendar_events(new_user_state['calendar_events'])
             user.user_state = new_user_state
+            user.save(update_fields=['user_state'])
         if isinstance(new_aigent_state, dict):
             aigent.aigent_state = new_aigent_state
             aigent.save(update_fields=['aigent_state'])
-        
-        user.save()
         app_logger.info(f"Updated states for user {user.id} and aigent {aigent.id}")
 
     except Exception as e:
@@ -177,7 +225,22 @@ def update_states_wrapper(user, aigent, new_user_state, new_aigent_state):
         raise
 
 # --- Main Celery Task ---
-@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+class ChatTask(Task):
+    """
+    Pushes the final outcome of a chat task to its per-task Redis results channel
+    (same shape as TaskStatusView), so clients do not have to poll for it.
+    Both hooks run after the result has been stored in the result backend.
+    """
+    def on_success(self, retval, task_id, args, kwargs):
+        user_id = args[0] if args else kwargs.get("user_id")
+        answer = retval.get("answer_to_user") if isinstance(retval, dict) else retval
+        publish_task_result(user_id, {"task_id": task_id, "status": states.SUCCESS, "result": {"answer_to_user": answer}})
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        user_id = args[0] if args else kwargs.get("user_id")
+        publish_task_result(user_id, {"task_id": task_id, "status": states.FAILURE, "error_message": str(exc)})
+
+@shared_task(bind=True, base=ChatTask, max_retries=3, default_retry_delay=60)
 def process_user_message_to_aigent(self, user_id: int, user_message_content: str):
     task_id = self.request.id
     app_logger.info(f"Task {task_id} [process_user_message_to_aigent] started for user_id: {user_id}")
@@ -211,12 +274,13 @@ def process_user_message_to_aigent(self, user_id: int, user_message_content: str
         llm_logger.info(f"--- LLM DECIDER PROMPT (Task: {task_id}) ---\n{decider_prompt}\n---")
 
         ollama_api_url = f"{active_aigent.ollama_endpoints[0].rstrip('/')}/api/generate"
-        payload = {"model": active_aigent.ollama_model_name, "prompt": decider_prompt, "stream": False, "format": "json"}
+        payload = {"model": active_aigent.ollama_model_name, "prompt": decider_prompt, "stream": True, "format": "json"}
         if active_aigent.ollama_temperature is not None: payload.setdefault("options", {})["temperature"] = active_aigent.ollama_temperature
         if active_aigent.ollama_context_length is not None: payload.setdefault("options", {})["num_ctx"] = active_aigent.ollama_context_length
-        
+
         app_logger.info(f"Task {task_id}: Sending DECIDER request to Ollama...")
-        decider_response_data = asyncio.run(make_ollama_request(ollama_api_url, payload, active_aigent.request_timeout_seconds))
+        # Never asyncio.run() here: see the shared-loop note in tools.executor.
+        decider_response_data = tool_executor.run_coroutine(make_ollama_request(ollama_api_url, payload, active_aigent.request_timeout_seconds))
         decider_raw_output = decider_response_data.get("response", "")
         llm_logger.info(f"--- LLM DECIDER RAW RESPONSE (Task: {task_id}) ---\n{decider_raw_output}\n---")
         
@@ -258,28 +322,24 @@ def process_user_message_to_aigent(self, user_id: int, user_message_content: str
             
             payload["prompt"] = synthesis_prompt
             app_logger.info(f"Task {task_id}: Sending SYNTHESIS request to Ollama...")
-            synthesis_response_data = asyncio.run(make_ollama_request(ollama_api_url, payload, active_aigent.request_timeout_seconds))
+            synthesis_response_data = tool_executor.run_coroutine(make_ollama_request(ollama_api_url, payload, active_aigent.request_timeout_seconds))
             synthesis_raw_output = synthesis_response_data.get("response", "")
             llm_logger.info(f"--- LLM SYNTHESIS RAW RESPONSE (Task: {task_id}) ---\n{synthesis_raw_output}\n---")
             
             cleaned_synthesis_json = extract_json_from_text(synthesis_raw_output)
-            final_structured_output = json.loads(cleaned_synthesis_json)
+            # Decode and validate against LLMOutput in a single pass.
+            final_structured_output = msgspec.json.decode(cleaned_synthesis_json, type=LLMOutput)
         else:
             # --- DIRECT ANSWER PATH ---
             app_logger.info(f"Task {task_id}: Aigent chose to answer directly.")
-            final_structured_output = structured_decider_output
+            final_structured_output = msgspec.convert(structured_decider_output, type=LLMOutput)
 
         # 4. FINALIZATION: Process the final result
-        required_keys = ["answer_to_user", "updated_aigent_state", "updated_user_state"]
-        if not all(key in final_structured_output for key in required_keys):
-            missing = [key for key in required_keys if key not in final_structured_output]
-            raise ValueError(f"Final LLM JSON output missing required keys: {missing}")
-
-        updated_user_state = final_structured_output["updated_user_state"]
-        updated_aigent_state = final_structured_output["updated_aigent_state"]
+        updated_user_state = final_structured_output.updated_user_state
+        updated_aigent_state = final_structured_output.updated_aigent_state
         update_states_wrapper(user, active_aigent, updated_user_state, updated_aigent_state)
 
-        answer_to_user = final_structured_output["answer_to_user"]
+        answer_to_user = final_structured_output.answer_to_user
         update_chat_history_wrapper(user, active_aigent, user_message_content, answer_to_user)
         
         app_logger.info(f"Task {task_id} successful. Answer: '{str(answer_to_user)[:100]}...'")
@@ -298,7 +358,7 @@ def process_user_message_to_aigent(self, user_id: int, user_message_content: str
         raise Exception(err_msg)
     
     except httpx.HTTPStatusError as e:
-        err_msg = f"Ollama API request failed: {e.response.status_code} - {e.response.text[:200]}"
+        err_msg = f"Ollama API request failed: {e.response.status_code} - {e.response.content[:200].decode('utf-8', errors='replace')}"
         app_logger.error(f"Task {task_id}: {err_msg}")
         if 500 <= e.response.status_code < 600:
             app_logger.info(f"Task {task_id}: Retrying (HTTPStatusError)...")
@@ -311,7 +371,7 @@ def process_user_message_to_aigent(self, user_id: int, user_message_content: str
         app_logger.info(f"Task {task_id}: Retrying (RequestError)...")
         raise self.retry(exc=e)
     
-    except (ValueError, json.JSONDecodeError, KeyError) as e:
+    except (ValueError, json.JSONDecodeError, KeyError, msgspec.ValidationError, msgspec.DecodeError) as e:
         err_msg = f"Task {task_id} data processing error ({type(e).__name__}): {e}"
         app_logger.error(err_msg, exc_info=True)
         # Usually non-retryable
@@ -0,0 +1,116 @@
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .admin import AigentAdmin
+from .models import ACTIVE_AIGENT_CACHE_KEY, Aigent, ChatHistory, get_active_aigent
+from .views import CHAT_HISTORY_PAGE_SIZE
+
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ActiveAigentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.aigent = Aigent.objects.create(name="Primary", is_active=True, ollama_model_name="llama3")
+        self.assertEqual(get_active_aigent().pk, self.aigent.pk)
+        self.assertIsNotNone(cache.get(ACTIVE_AIGENT_CACHE_KEY))
+
+    def test_state_only_save_keeps_cache(self):
+        self.aigent.aigent_state = {"current_goal": "updated"}
+        self.aigent.save(update_fields=['aigent_state'])
+        self.assertIsNotNone(cache.get(ACTIVE_AIGENT_CACHE_KEY))
+
+    def test_rename_invalidates_cache(self):
+        self.aigent.name = "Renamed"
+        self.aigent.save(update_fields=['name'])
+        self.assertIsNone(cache.get(ACTIVE_AIGENT_CACHE_KEY))
+        self.assertEqual(get_active_aigent().name, "Renamed")
+
+    def test_full_save_invalidates_cache(self):
+        self.aigent.save()
+        self.assertIsNone(cache.get(ACTIVE_AIGENT_CACHE_KEY))
+
+    def test_activating_another_aigent_switches_cached_one(self):
+        other = Aigent.objects.create(name="Secondary", is_active=True, ollama_model_name="llama3")
+        self.assertEqual(get_active_aigent().pk, other.pk)
+        self.aigent.refresh_from_db()
+        self.assertFalse(self.aigent.is_active)
+
+    def test_queryset_delete_invalidates_cache(self):
+        Aigent.objects.filter(pk=self.aigent.pk).delete()
+        self.assertIsNone(cache.get(ACTIVE_AIGENT_CACHE_KEY))
+        self.assertIsNone(get_active_aigent())
+
+    def test_admin_delete_selected_invalidates_cache(self):
+        AigentAdmin(Aigent, admin.site).delete_queryset(None, Aigent.objects.filter(pk=self.aigent.pk))
+        self.assertIsNone(get_active_aigent())
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ChatHistoryCursorTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="erin", password="pw-erin-123")
+        self.aigent = Aigent.objects.create(name="Historian", is_active=True, ollama_model_name="llama3")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('aigents_api:chat_history')
+
+    def set_history(self, length):
+        history = [
+            {"role": "user", "content": f"m{i}", "timestamp": 1_700_000_000_000 + i}
+            for i in range(length)
+        ]
+        ChatHistory.objects.update_or_create(user=self.user, aigent=self.aigent, defaults={'history': history})
+
+    def get_page(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        return [m["content"] for m in data["history"]], data["next_cursor"]
+
+    def test_one_under_page_size(self):
+        self.set_history(CHAT_HISTORY_PAGE_SIZE - 1)
+        contents, next_cursor = self.get_page()
+        self.assertEqual(len(contents), CHAT_HISTORY_PAGE_SIZE - 1)
+        self.assertEqual(contents[0], "m0")
+        self.assertIsNone(next_cursor)
+
+    def test_exactly_page_size(self):
+        self.set_history(CHAT_HISTORY_PAGE_SIZE)
+        contents, next_cursor = self.get_page()
+        self.assertEqual(contents, [f"m{i}" for i in range(CHAT_HISTORY_PAGE_SIZE)])
+        self.assertIsNone(next_cursor)
+
+    def test_one_over_page_size(self):
+        self.set_history(CHAT_HISTORY_PAGE_SIZE + 1)
+        contents, next_cursor = self.get_page()
+        self.assertEqual(contents, [f"m{i}" for i in range(1, CHAT_HISTORY_PAGE_SIZE + 1)])
+        self.assertEqual(next_cursor, 1)
+
+        older, older_cursor = self.get_page(cursor=next_cursor)
+        self.assertEqual(older, ["m0"])
+        self.assertIsNone(older_cursor)
+
+    def test_pages_cover_history_without_gaps_or_overlap(self):
+        self.set_history(7)
+        seen, cursor = self.get_page(limit=3)
+        while cursor is not None:
+            older, cursor = self.get_page(limit=3, cursor=cursor)
+            seen = older + seen
+        self.assertEqual(seen, [f"m{i}" for i in range(7)])
+
+    def test_cursor_zero_and_past_end(self):
+        self.set_history(5)
+        self.assertEqual(self.get_page(cursor=0), ([], None))
+        contents, next_cursor = self.get_page(cursor=99, limit=2)
+        self.assertEqual((contents, next_cursor), (["m3", "m4"], 3))
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in ({"limit": "abc"}, {"cursor": "-1"}, {"limit": "0"}):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400)
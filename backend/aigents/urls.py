@@ -2,6 +2,7 @@ from django.urls import path
 from .views import (
     SendMessageView, 
     TaskStatusView, 
+    TaskEventsView,
     ChatHistoryView,
     AigentListView,           # NEW
     SetActiveAigentView       # NEW
@@ -10,12 +11,13 @@ from .views import (
 app_name = 'aigents_api'
 
 urlpatterns = [
+    # Chat endpoints, most frequently hit (status polling) first
+    path('chat/task_status/<uuid:task_id>/', TaskStatusView.as_view(), name='task_status'),
+    path('chat/task_events/<uuid:task_id>/', TaskEventsView.as_view(), name='task_events'),
+    path('chat/send_message/', SendMessageView.as_view(), name='send_message'),
+    path('chat/history/', ChatHistoryView.as_view(), name='chat_history'),
+
     # NEW endpoints for managing aigents
     path('aigents/list/', AigentListView.as_view(), name='aigent_list'),
     path('aigents/set_active/', SetActiveAigentView.as_view(), name='set_active_aigent'),
-
-    # Existing chat endpoints
-    path('chat/send_message/', SendMessageView.as_view(), name='send_message'),
-    path('chat/task_status/<uuid:task_id>/', TaskStatusView.as_view(), name='task_status'),
-    path('chat/history/', ChatHistoryView.as_view(), name='chat_history'),
 ]
\ No newline at end of file
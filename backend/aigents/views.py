@@ -4,31 +4,43 @@ from rest_framework.views import APIView
 from django.shortcuts import render, redirect
 from django.views.generic import TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from asgiref.sync import sync_to_async
 
-from celery.result import AsyncResult
+from celery import states
+from kombu.exceptions import OperationalError
 
-from .models import Aigent, ChatHistory
+from lba_project.celery import app as celery_app
+from lba_project.renderers import ORJSONResponse
+
+from .models import Aigent, ChatHistory, get_active_aigent, invalidate_active_aigent_cache
 from .serializers import (
     ChatMessageSendSerializer, 
-    TaskStatusSerializer,
     UserChatHistorySerializer,
-    AigentListSerializer,
     SetActiveAigentSerializer
 )
+from .streaming import stream_task_result
 from .tasks import process_user_message_to_aigent
 
 import logging
 logger = logging.getLogger('aigents')
 
-class AigentListView(generics.ListAPIView):
+_CHAT_TASK_NAME = process_user_message_to_aigent.name
+
+class AigentListView(APIView):
     """
     API endpoint to list all available Aigents.
     Includes an 'is_active' flag for the current user's session.
     """
-    queryset = Aigent.objects.all().order_by('name')
-    serializer_class = AigentListSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get(self, request, *args, **kwargs):
+        # Plain dicts straight from the DB: no model instances, no serializer.
+        aigents = Aigent.objects.values('id', 'name', 'is_active', 'presentation_format').order_by('name')
+        return Response(list(aigents), status=status.HTTP_200_OK)
+
 class SetActiveAigentView(generics.GenericAPIView):
     """
     API endpoint to set the active Aigent for the user.
@@ -43,19 +55,26 @@ class SetActiveAigentView(generics.GenericAPIView):
         aigent_id = serializer.validated_data['aigent_id']
 
         try:
-            # The Aigent model's .save() method automatically handles
-            # deactivating any other active Aigents.
-            aigent_to_activate = Aigent.objects.get(pk=aigent_id)
-            aigent_to_activate.is_active = True
-            aigent_to_activate.save()
-            
-            logger.info(f"User {request.user.username} switched active aigent to: {aigent_to_activate.name}")
+            # Two targeted UPDATEs instead of get() + save(). Deactivate first so
+            # the single-active-aigent constraint is never violated mid-transaction.
+            with transaction.atomic():
+                Aigent.objects.filter(is_active=True).exclude(pk=aigent_id).update(is_active=False)
+                updated = Aigent.objects.filter(pk=aigent_id).update(is_active=True)
+                if not updated:
+                    transaction.set_rollback(True)
+
+            if not updated:
+                return Response({"error": "Aigent not found."}, status=status.HTTP_404_NOT_FOUND)
+
+            # Bulk updates bypass Aigent.save(), so invalidate explicitly.
+            invalidate_active_aigent_cache()
+
+            aigent_name = Aigent.objects.values_list('name', flat=True).get(pk=aigent_id)
+            logger.info(f"User {request.user.username} switched active aigent to {aigent_name} (ID: {aigent_id})")
             return Response(
-                {"detail": f"Active aigent switched to {aigent_to_activate.name}."},
+                {"detail": f"Active aigent switched to {aigent_name}."},
                 status=status.HTTP_200_OK
             )
-        except Aigent.DoesNotExist:
-            return Response({"error": "Aigent not found."}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             logger.error(f"Error switching active aigent for user {request.user.username}: {e}")
             return Response({"error": "An error occurred while switching aigents."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -64,7 +83,7 @@ class SetActiveAigentView(generics.GenericAPIView):
 class SendMessageView(generics.GenericAPIView):
     """
     API endpoint to send a message from the user to the active Aigent.
-    Triggers a Celery task for processing.
+    Triggers a Celery task for processing and returns 202 immediately.
     """
     serializer_class = ChatMessageSendSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -76,32 +95,95 @@ class SendMessageView(generics.GenericAPIView):
         user = request.user
         message_content = serializer.validated_data['message']
 
-        logger.info(f"User {user.username} (ID: {user.id}) sending message: '{message_content[:50]}...'")
-
-        try:
-            active_aigent = Aigent.objects.get(is_active=True)
-            logger.info(f"Dispatching message to active Aigent: {active_aigent.name}")
-        except Aigent.DoesNotExist:
+        # Cache-backed sanity check only; the task loads the full Aigent itself.
+        if get_active_aigent() is None:
             logger.error(f"SendMessageView: No active Aigent found for user {user.username}.")
             return Response(
                 {"error": "No active Aigent configured in the system."},
                 status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
-        except Aigent.MultipleObjectsReturned:
-            logger.error(f"SendMessageView: Multiple active Aigents found. This should not happen.")
+
+        # Name and route are resolved up front; retry=False keeps broker
+        # reconnect loops off the request path (the client gets a 503 instead).
+        try:
+            task = celery_app.send_task(_CHAT_TASK_NAME, (user.id, message_content), retry=False)
+        except OperationalError as e:
+            logger.error(f"SendMessageView: Could not dispatch task for user {user.username}: {e}")
             return Response(
-                {"error": "System configuration error: Multiple active Aigents."},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {"error": "Message queue unavailable, please try again."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
 
-        task = process_user_message_to_aigent.delay(user.id, message_content)
-        logger.info(f"Celery task {task.id} dispatched for user {user.username}.")
+        # One lazily formatted record per message instead of one per step.
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "User %s (ID: %s) sent message '%s...'; dispatched task %s.",
+                user.username, user.id, message_content[:50], task.id
+            )
 
         return Response(
             {"task_id": task.id, "detail": "Message received and processing started."},
             status=status.HTTP_202_ACCEPTED
         )
 
+TASK_STATUS_CACHE_TIMEOUT = 3600 # seconds a finished task's payload stays cached
+
+def task_status_cache_key(task_id: str) -> str:
+    return f"task-status:{task_id}"
+
+# The status endpoint only ever returns one of these three shapes; building
+# them by hand avoids instantiating a DRF serializer per poll.
+def _ok(task_id: str, result) -> dict:
+    return {"task_id": task_id, "status": states.SUCCESS, "result": result}
+
+def _fail(task_id: str, error_message: str, task_status: str = states.FAILURE) -> dict:
+    return {"task_id": task_id, "status": task_status, "error_message": error_message}
+
+def _pending(task_id: str, task_status: str) -> dict:
+    return {"task_id": task_id, "status": task_status}
+
+def get_task_status_payload(task_id: str) -> dict:
+    """
+    Builds the task status response (task_id, status and result or
+    error_message) from a single result-backend read.
+    Terminal payloads are cached, so repeated polls never go back to the
+    backend (and still work with backends that deliver a result only once,
+    such as rpc://).
+    """
+    cache_key = task_status_cache_key(task_id)
+    cached_payload = cache.get(cache_key)
+    if cached_payload is not None:
+        return cached_payload
+
+    # Bound to the project app, so reads go through its pooled backend connection.
+    async_result = celery_app.AsyncResult(task_id)
+    # Read the task meta once; every AsyncResult accessor (.status, .result,
+    # .info, .traceback) would otherwise be a separate result-backend fetch.
+    meta = async_result.backend.get_task_meta(async_result.id)
+    task_status = meta["status"]
+    task_result_data = meta.get("result")
+
+    if task_status == states.SUCCESS:
+        if isinstance(task_result_data, dict) and "answer_to_user" in task_result_data:
+            response_data = _ok(task_id, {"answer_to_user": task_result_data["answer_to_user"]})
+        else:
+            response_data = _ok(task_id, task_result_data)
+            logger.warning(f"Task {task_id} succeeded but result format unexpected: {task_result_data}")
+    elif task_status == states.FAILURE:
+        error_info = task_result_data
+        response_data = _fail(task_id, str(error_info) if error_info else "Task failed with an unknown error.")
+        logger.error(f"Task {task_id} failed. Info: {error_info}. Traceback: {meta.get('traceback')}")
+    elif task_status == states.RETRY:
+        response_data = _fail(task_id, f"Task is being retried. Info: {str(task_result_data)}", task_status)
+    else:
+        response_data = _pending(task_id, task_status)
+
+    if task_status in (states.SUCCESS, states.FAILURE):
+        cache.set(cache_key, response_data, TASK_STATUS_CACHE_TIMEOUT)
+
+    return response_data
+
+
 class TaskStatusView(APIView):
     """
     API endpoint to check the status and result of a Celery task.
@@ -109,61 +191,74 @@ class TaskStatusView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, task_id, *args, **kwargs):
-        logger.debug(f"User {request.user.username} checking status for task_id: {task_id}")
-        async_result = AsyncResult(str(task_id))
-        response_data = {
-            "task_id": async_result.id,
-            "status": async_result.status,
-        }
-
-        if async_result.successful():
-            task_result_data = async_result.result
-            if isinstance(task_result_data, dict) and "answer_to_user" in task_result_data:
-                response_data["result"] = {"answer_to_user": task_result_data["answer_to_user"]}
-            else:
-                response_data["result"] = task_result_data
-                logger.warning(f"Task {task_id} succeeded but result format unexpected: {task_result_data}")
-        elif async_result.failed():
-            error_info = async_result.info 
-            response_data["error_message"] = str(error_info) if error_info else "Task failed with an unknown error."
-            logger.error(f"Task {task_id} failed. Info: {error_info}. Traceback: {async_result.traceback}")
-        elif async_result.status == 'RETRY':
-             response_data["error_message"] = f"Task is being retried. Info: {str(async_result.info)}"
-
-        serializer = TaskStatusSerializer(data=response_data)
-        if serializer.is_valid():
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        else:
-            logger.error(f"TaskStatusView: Failed to serialize response for task {task_id}. Errors: {serializer.errors}")
-            return Response(serializer.errors, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("User %s checking status for task_id: %s", request.user.username, task_id)
+        # Polled frequently: skip DRF rendering and serialize the dict directly.
+        return ORJSONResponse(get_task_status_payload(str(task_id)), status=status.HTTP_200_OK)
+
+
+class TaskEventsView(APIView):
+    """
+    Server-Sent Events endpoint that pushes a task's final status as soon as
+    the worker publishes it, replacing repeated TaskStatusView polls.
+    """
+    permission_classes = [permissions.IsAuthenticated]
 
+    def get(self, request, task_id, *args, **kwargs):
+        events = stream_task_result(request.user.id, str(task_id), sync_to_async(get_task_status_payload))
+        response = StreamingHttpResponse(events, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no' # Let Nginx pass events through unbuffered
+        return response
+
+
+CHAT_HISTORY_PAGE_SIZE = 50
+CHAT_HISTORY_MAX_PAGE_SIZE = 200
 
 class ChatHistoryView(generics.GenericAPIView):
     """
     API endpoint to retrieve (GET) or delete (DELETE) the user's chat history 
     with the active Aigent.
+    GET returns the newest `limit` messages; pass the returned `next_cursor`
+    back as `cursor` to fetch the page of older messages before them.
     """
     serializer_class = UserChatHistorySerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
         user = request.user
-        logger.info(f"Fetching chat history for user {user.username} (ID: {user.id}).")
-
         try:
-            active_aigent = Aigent.objects.get(is_active=True)
-        except (Aigent.DoesNotExist, Aigent.MultipleObjectsReturned):
-            logger.warning(f"ChatHistoryView: No active Aigent found for user {user.username}.")
-            return Response({"history": [], "detail": "No active Aigent configured."}, status=status.HTTP_200_OK)
+            limit = int(request.query_params.get('limit', CHAT_HISTORY_PAGE_SIZE))
+            cursor = request.query_params.get('cursor')
+            cursor = int(cursor) if cursor is not None else None
+        except ValueError:
+            return Response({"error": "'cursor' and 'limit' must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1 or (cursor is not None and cursor < 0):
+            return Response({"error": "'cursor' must be >= 0 and 'limit' >= 1."}, status=status.HTTP_400_BAD_REQUEST)
+        limit = min(limit, CHAT_HISTORY_MAX_PAGE_SIZE)
 
-        try:
-            chat_history_obj = ChatHistory.objects.get(user=user, aigent=active_aigent)
-            history_data = chat_history_obj.history if isinstance(chat_history_obj.history, list) else []
-        except ChatHistory.DoesNotExist:
-            logger.info(f"No chat history found for user {user.username} with aigent {active_aigent.name}.")
+        logger.info(f"Fetching chat history for user {user.username} (ID: {user.id}).")
+
+        # One query joined to the active Aigent, returning the raw history value
+        # without building a ChatHistory instance.
+        history_data = (
+            ChatHistory.objects
+            .filter(user=user, aigent__is_active=True)
+            .values_list('history', flat=True)
+            .first()
+        )
+        if not isinstance(history_data, list):
             history_data = []
+
+        # The cursor is the (exclusive) end index of the page, counted from the
+        # oldest message; pages are cut from the newest end backwards.
+        end = len(history_data) if cursor is None else min(cursor, len(history_data))
+        start = max(end - limit, 0)
         
-        serializer = self.get_serializer({"history": history_data})
+        serializer = self.get_serializer({
+            "history": history_data[start:end],
+            "next_cursor": start if start > 0 else None,
+        })
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def delete(self, request, *args, **kwargs):
@@ -173,9 +268,8 @@ class ChatHistoryView(generics.GenericAPIView):
         user = request.user
         logger.info(f"Attempting to delete chat history for user {user.username} (ID: {user.id}).")
 
-        try:
-            active_aigent = Aigent.objects.get(is_active=True)
-        except (Aigent.DoesNotExist, Aigent.MultipleObjectsReturned):
+        active_aigent = get_active_aigent()
+        if active_aigent is None:
             logger.error(f"Cannot delete history: Active Aigent configuration is invalid for user {user.username}.")
             return Response(
                 {"error": "System configuration error preventing history deletion."}, 
@@ -0,0 +1,20 @@
+# backend/lba_project/logging_utils.py
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+def make_queue_handler(filename, mode='a', encoding=None):
+    """
+    LOGGING handler factory: returns a QueueHandler whose records are written
+    to `filename` by a background QueueListener, keeping file I/O off the
+    request and task threads.
+    """
+    log_queue = queue.SimpleQueue()
+    file_handler = logging.FileHandler(filename, mode=mode, encoding=encoding)
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    # Flush whatever is still queued when the process exits.
+    atexit.register(listener.stop)
+    return QueueHandler(log_queue)
@@ -0,0 +1,36 @@
+# backend/lba_project/renderers.py
+import orjson
+from django.http import HttpResponse
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+# DRF's encoder handles the types orjson does not (Decimal, lazy strings, ...).
+_fallback_encoder = JSONEncoder()
+
+# Raw datetimes (e.g. from plain dicts passed to ORJSONResponse) are emitted
+# as UTC with a 'Z' suffix, matching what DRF's DateTimeField produces.
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+class ORJSONRenderer(renderers.BaseRenderer):
+    """
+    Renders API responses with orjson instead of the stdlib json module.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=_fallback_encoder.default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(HttpResponse):
+    """
+    Plain Django response serialized with orjson, for hot endpoints whose
+    payload is already a dict and needs no DRF content negotiation.
+    """
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=orjson.dumps(data, default=_fallback_encoder.default, option=ORJSON_OPTIONS), **kwargs)
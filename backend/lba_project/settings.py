@@ -87,6 +87,16 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# Argon2 (C implementation via argon2-cffi) for new hashes; the PBKDF2 hashers
+# stay listed so existing passwords still verify and are upgraded on login.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -111,6 +121,10 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'lba_project.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
 # Celery Configuration
@@ -122,6 +136,34 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 CELERY_TASK_TRACK_STARTED = True
+# Broker connections kept open and reused by web processes dispatching tasks.
+CELERY_BROKER_POOL_LIMIT = 50
+# Chat turns get their own queue so they never wait behind other tasks.
+CELERY_TASK_ROUTES = {
+    'aigents.tasks.process_user_message_to_aigent': {'queue': 'chat'},
+}
+# Chat turns vary from seconds to minutes: a worker reserves no more than its
+# concurrency, leaving the rest on the queue for whichever worker frees up first.
+# Tasks keep the default early ack: the chat task is not idempotent (it appends
+# chat history and can create calendar events), so it must not be redelivered.
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# Keep result payloads small: TaskStatusView polls them frequently.
+CELERY_RESULT_EXTENDED = False
+# Keep pooled result-backend connections alive across idle periods, and probe
+# them before reuse, so status reads never pay for a fresh TCP connect.
+CELERY_REDIS_SOCKET_KEEPALIVE = True
+CELERY_REDIS_BACKEND_HEALTH_CHECK_INTERVAL = 30
+
+# Redis used by the application itself (cache, pub/sub of final task results).
+REDIS_URL = env('REDIS_URL', default='redis://redis:6379/1')
+
+# Shared cache so invalidations are seen by every web and worker process.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    }
+}
 
 # --- NEW, SIMPLIFIED LOGGING CONFIGURATION ---
 # This configuration ONLY logs to the console (stdout/stderr), which is the
@@ -146,9 +188,10 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
-        # Handler specifically for LLM interactions. Outputs to a file.
+        # Handler specifically for LLM interactions. Outputs to a file, written
+        # by a background thread so large prompts don't block the worker.
         'llm_file': {
-            'class': 'logging.FileHandler',
+            '()': 'lba_project.logging_utils.make_queue_handler',
             'filename': BASE_DIR / 'llm_interaction.log', # Correct path inside the container
             'formatter': 'verbose',
         },
@@ -6,15 +6,20 @@ from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
-from users.views import CalendarEventListView
+from users.views import BulkCalendarEventCreateView, CalendarEventListView
 
+# Ordered by traffic: the resolver tries patterns top to bottom, so the
+# API (polled by every open chat) comes first and the admin last.
 urlpatterns = [
-    path('admin/', admin.site.urls),
-
     # API v1 URLs
-    path('api/v1/auth/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('api/v1/auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    path('api/v1/auth/', include('users.urls', namespace='users_api')),
-    path('api/v1/', include('aigents.urls', namespace='aigents_api')),
-    path('api/v1/calendar/events/', CalendarEventListView.as_view(), name='calendar_events_list'),
+    path('api/v1/', include([
+        path('', include('aigents.urls', namespace='aigents_api')),
+        path('calendar/events/', CalendarEventListView.as_view(), name='calendar_events_list'),
+        path('calendar/events/bulk/', BulkCalendarEventCreateView.as_view(), name='calendar_events_bulk_create'),
+        path('auth/', include('users.urls', namespace='users_api')),
+        path('auth/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+        path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    ])),
+
+    path('admin/', admin.site.urls),
 ]
\ No newline at end of file
@@ -1,8 +1,10 @@
 # backend/tools/executor.py
+import functools
 import logging
 import importlib
 import inspect
 import asyncio # <-- NEW IMPORT
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -11,9 +13,55 @@ TOOL_REGISTRY = {
     "manage_calendar": "tools.tool_library.calendar_tool.manage_calendar",
 }
 
+# One event loop per process, running on a daemon thread, shared by every
+# async call the worker makes: async tools and the chat task's Ollama requests.
+# Nothing in the worker may call asyncio.run(): under the gevent pool this
+# "thread" is a greenlet on the worker's only OS thread, so asyncio sees the
+# loop as running everywhere and asyncio.run() raises RuntimeError.
+_tool_loop = None
+_tool_loop_thread = None
+_tool_loop_lock = threading.Lock()
+
+def _get_tool_loop() -> asyncio.AbstractEventLoop:
+    global _tool_loop, _tool_loop_thread
+    with _tool_loop_lock:
+        if _tool_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="tool-event-loop", daemon=True)
+            thread.start()
+            _tool_loop, _tool_loop_thread = loop, thread
+    return _tool_loop
+
+def run_coroutine(coro):
+    """
+    Runs a coroutine on the shared loop and blocks until it finishes. This is
+    the worker's replacement for asyncio.run().
+    """
+    loop = _get_tool_loop()
+    if threading.current_thread() is _tool_loop_thread:
+        # Blocking the loop on its own future would hang the worker for good.
+        coro.close()
+        raise RuntimeError("run_coroutine() called from the shared event loop; await the coroutine instead.")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+def _make_sync(coroutine_function):
+    """
+    Wraps an async tool so it runs on the shared tool loop when called, the
+    same way the chat task runs its Ollama requests. Never wrap with
+    asyncio.run(): see the shared-loop note above.
+    """
+    # functools.wraps keeps __wrapped__, so inspect.signature() still reports
+    # the tool's own parameters (the chat task relies on this for user_id).
+    @functools.wraps(coroutine_function)
+    def run_sync(**kwargs):
+        return run_coroutine(coroutine_function(**kwargs))
+    return run_sync
+
+@functools.cache
 def get_tool_function(tool_name: str):
     """
-    Dynamically imports and returns the callable function for a given tool.
+    Imports a registered tool once per process and returns it as a
+    synchronous callable; async tools are wrapped to run on the shared loop.
     Returns None if the tool is not found or fails to import.
     """
     if tool_name not in TOOL_REGISTRY:
@@ -23,10 +71,16 @@ def get_tool_function(tool_name: str):
     try:
         module_path, function_name = import_path.rsplit('.', 1)
         module = importlib.import_module(module_path)
-        return getattr(module, function_name, None)
+        tool_function = getattr(module, function_name, None)
     except (ImportError, AttributeError, ValueError):
         logger.error(f"Failed to get function for tool '{tool_name}' from path '{import_path}'.")
         return None
+    if not callable(tool_function):
+        logger.error(f"Registry path '{import_path}' for tool '{tool_name}' does not point to a callable.")
+        return None
+    if inspect.iscoroutinefunction(tool_function):
+        return _make_sync(tool_function)
+    return tool_function
 
 # UPDATED: This function is now SYNCHRONOUS, but can call ASYNC tools.
 def execute_tool(tool_name: str, parameters: dict) -> str:
@@ -43,14 +97,9 @@ def execute_tool(tool_name: str, parameters: dict) -> str:
         return f"Error: Tool '{tool_name}' is not available or configured incorrectly."
 
     try:
-        # Check if the tool function is a coroutine function (async def)
-        if inspect.iscoroutinefunction(tool_function):
-            # If it's async, run it in its own event loop.
-            result = asyncio.run(tool_function(**parameters))
-        else:
-            # If it's sync, run it directly.
-            result = tool_function(**parameters)
-            
+        # Async tools were wrapped into sync callables when resolved.
+        result = tool_function(**parameters)
+
         logger.info(f"Tool '{tool_name}' executed successfully.")
         return str(result)
     except TypeError as e:
@@ -1,3 +1,5 @@
+import orjson
+import random
 import requests
 import time
 from urllib.parse import urlencode
@@ -12,26 +14,34 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.stdout.write(self.style.HTTP_INFO(f"🚀 Starting SearXNG Test Suite for {SEARXNG_URL}"))
         
-        if not self.wait_for_service():
-            self.stdout.write(self.style.ERROR("❌ Test failed: SearXNG service did not become available."))
-            return
+        # One session for the whole run, so the readiness probes and the
+        # search reuse the same keep-alive connection.
+        with requests.Session() as self.session:
+            if not self.wait_for_service():
+                self.stdout.write(self.style.ERROR("❌ Test failed: SearXNG service did not become available."))
+                return
 
-        self.test_json_search()
+            self.test_json_search()
 
     def wait_for_service(self, timeout=30):
         self.stdout.write("⏳ Waiting for SearXNG service to be ready...")
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
+        attempt = 0
         
-        while time.time() - start_time < timeout:
+        while time.monotonic() < deadline:
             try:
-                response = requests.get(f"{SEARXNG_URL}/", timeout=5)
+                # Short connect timeout: a service that isn't up yet fails fast.
+                response = self.session.get(f"{SEARXNG_URL}/", timeout=(0.5, 5))
                 if response.status_code == 200:
                     self.stdout.write(self.style.SUCCESS("✅ SearXNG service is ready!"))
                     return True
             except requests.exceptions.RequestException:
                 pass
             
-            time.sleep(2)
+            # Exponential backoff with jitter, capped at 2s between probes.
+            delay = min(0.05 * (2 ** attempt), 2.0)
+            time.sleep(random.uniform(delay / 2, delay))
+            attempt += 1
         
         return False
 
@@ -44,11 +54,11 @@ class Command(BaseCommand):
             url = f"{SEARXNG_URL}/search"
             self.stdout.write(f"   Making request to: {url}?{urlencode(params)}")
             
-            response = requests.get(url, params=params, timeout=15)
+            response = self.session.get(url, params=params, timeout=15)
             self.stdout.write(f"   Response status: {response.status_code}")
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 results = data.get('results', [])
                 
                 if results:
@@ -67,11 +77,11 @@ class Command(BaseCommand):
                 return True
             else:
                 self.stdout.write(self.style.ERROR(f"❌ JSON Search failed with status {response.status_code}"))
-                self.stdout.write(f"   Response: {response.text[:500]}")
+                self.stdout.write(f"   Response: {response.content[:500].decode('utf-8', errors='replace')}")
                 self.stdout.write(self.style.ERROR("🎯 Test FAILED."))
                 return False
                 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             self.stdout.write(self.style.ERROR(f"❌ JSON Search failed with an exception: {e}"))
             self.stdout.write(self.style.ERROR("🎯 Test FAILED."))
             return False
\ No newline at end of file
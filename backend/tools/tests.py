@@ -1,3 +1,107 @@
-from django.test import TestCase
+import asyncio
+import inspect
+import threading
+from datetime import datetime, timezone
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from tools import executor
+from tools.tool_library.calendar_tool import manage_calendar
+from users.models import CalendarEvent
+
+
+async def _async_tool(query: str, user_id: int = None):
+    await asyncio.sleep(0)
+    return f"{query}:{user_id}"
+
+
+class ExecutorLoopTests(SimpleTestCase):
+    def setUp(self):
+        executor.get_tool_function.cache_clear()
+        self.addCleanup(executor.get_tool_function.cache_clear)
+        registry = {**executor.TOOL_REGISTRY, "async_tool": f"{__name__}._async_tool"}
+        patcher = mock.patch.dict(executor.TOOL_REGISTRY, registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_async_tool_is_wrapped_and_keeps_its_signature(self):
+        tool = executor.get_tool_function("async_tool")
+        self.assertFalse(inspect.iscoroutinefunction(tool))
+        self.assertIn('user_id', inspect.signature(tool).parameters)
+        self.assertEqual(tool(query="a", user_id=1), "a:1")
+        # Repeated calls reuse the same running loop.
+        self.assertEqual(tool(query="b", user_id=2), "b:2")
+
+    def test_shared_loop_does_not_block_asyncio_run_in_caller(self):
+        executor.run_coroutine(_async_tool("x"))
+        self.assertEqual(asyncio.run(_async_tool("y", 3)), "y:3")
+
+    def test_execute_tool_returns_string_result(self):
+        self.assertEqual(executor.execute_tool("async_tool", {"query": "q"}), "q:None")
+
+    def test_run_coroutine_from_loop_thread_raises_instead_of_hanging(self):
+        async def nested():
+            return executor.run_coroutine(_async_tool("z"))
+        with self.assertRaises(RuntimeError):
+            executor.run_coroutine(nested())
+
+    def test_concurrent_callers_share_one_loop(self):
+        results = []
+        def call(i):
+            results.append(executor.run_coroutine(_async_tool(str(i))))
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertCountEqual(results, [f"{i}:None" for i in range(5)])
+
+
+class CalendarToolAddBulkTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="carol", password="pw-carol-123", timezone="Europe/Berlin")
+
+    def add_bulk(self, events):
+        return manage_calendar('add_bulk', self.user.id, events=events)
+
+    def test_all_valid_events_are_created_in_user_timezone(self):
+        result = self.add_bulk([
+            {"title": "A", "start_time": "2030-01-01 09:00:00", "end_time": "2030-01-01 10:00:00"},
+            {"title": "B", "start_time": "2030-01-02T09:00:00+00:00", "end_time": "2030-01-02T10:00:00+00:00"},
+        ])
+        self.assertIn("Successfully added 2 events", result)
+        self.assertNotIn("Error", result)
+        first = CalendarEvent.objects.get(user=self.user, title="A")
+        self.assertEqual(first.start_time, datetime(2030, 1, 1, 8, 0, tzinfo=timezone.utc))
+
+    def test_bad_items_are_reported_and_valid_ones_kept(self):
+        result = self.add_bulk([
+            {"title": "Good", "start_time": "2030-01-01 09:00:00", "end_time": "2030-01-01 10:00:00"},
+            {"title": "BadFormat", "start_time": "tomorrow", "end_time": "2030-01-01 10:00:00"},
+            {"title": "NotAString", "start_time": 20300101, "end_time": "2030-01-01 10:00:00"},
+            {"title": "Missing", "start_time": "2030-01-01 09:00:00"},
+        ])
+        self.assertIn("Successfully added 1 events: 'Good'", result)
+        self.assertIn("3 events could not be added", result)
+        for marker in ("#2 ('BadFormat'): ValueError", "#3 ('NotAString'): TypeError", "#4: "):
+            self.assertIn(marker, result)
+        self.assertEqual(list(CalendarEvent.objects.filter(user=self.user).values_list('title', flat=True)), ["Good"])
+
+    def test_unknown_timezone_is_reported_per_item(self):
+        get_user_model().objects.filter(pk=self.user.pk).update(timezone="Mars/Olympus_Mons")
+        result = self.add_bulk([
+            {"title": "Naive", "start_time": "2030-01-01 09:00:00", "end_time": "2030-01-01 10:00:00"},
+            {"title": "Aware", "start_time": "2030-01-01T09:00:00+00:00", "end_time": "2030-01-01T10:00:00+00:00"},
+        ])
+        self.assertIn("#1 ('Naive'): ZoneInfoNotFoundError", result)
+        self.assertIn("Successfully added 1 events: 'Aware'", result)
+
+    def test_all_invalid_creates_nothing(self):
+        result = self.add_bulk([{"title": "X", "start_time": "nope", "end_time": "nope"}])
+        self.assertTrue(result.startswith("Error: 1 events could not be added"))
+        self.assertFalse(CalendarEvent.objects.exists())
+
+    def test_empty_list_is_rejected(self):
+        self.assertTrue(self.add_bulk([]).startswith("Error"))
@@ -1,22 +1,27 @@
 # backend/tools/tool_library/calendar_tool.py
-from datetime import datetime
-import pytz
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone as django_timezone
 from users.models import CalendarEvent
+from users.signals import adjust_calendar_events_count
 
 User = get_user_model()
 
 # Helper to parse datetime strings with timezone awareness
 def _parse_datetime(time_str: str, user_timezone_str: str) -> datetime:
-    user_tz = pytz.timezone(user_timezone_str)
-    # Assume "YYYY-MM-DD HH:MM:SS" format for simplicity
-    dt_naive = datetime.strptime(time_str, "%Y-%m-%d %H:%M:%S")
-    dt_aware = user_tz.localize(dt_naive)
-    return dt_aware.astimezone(pytz.utc)
+    # Expected "YYYY-MM-DD HH:MM:SS"; fromisoformat is C-implemented (unlike
+    # strptime) and also accepts ISO 8601 variants the LLM may produce.
+    dt = datetime.fromisoformat(time_str)
+    if dt.tzinfo is None:
+        # ZoneInfo caches instances per key, so repeated lookups don't re-read tzdata.
+        dt = dt.replace(tzinfo=ZoneInfo(user_timezone_str))
+    return dt.astimezone(timezone.utc)
 
-def _add_event(user, title, description, start_time_utc, end_time_utc):
+def _add_event(user_id, title, description, start_time_utc, end_time_utc):
     event = CalendarEvent.objects.create(
-        user=user,
+        user_id=user_id,
         title=title,
         description=description,
         start_time=start_time_utc,
@@ -24,39 +29,90 @@ def _add_event(user, title, description, start_time_utc, end_time_utc):
     )
     return f"Successfully added event '{event.title}' with ID {event.id}."
 
-def _list_events(user):
-    now_utc = datetime.now(pytz.utc)
-    events = CalendarEvent.objects.filter(user=user, end_time__gte=now_utc).order_by('start_time')[:10]
-    if not events.exists():
+def _add_events_bulk(user_id, user_tz, events):
+    # Parse every entry first; a bad entry is reported on its own and the valid
+    # ones are still written in a single multi-row INSERT.
+    new_events = []
+    failures = []
+    for index, e in enumerate(events, 1):
+        if not isinstance(e, dict) or not e.get('start_time') or not e.get('end_time'):
+            failures.append(f"#{index}: 'start_time' and 'end_time' are required")
+            continue
+        try:
+            new_events.append(CalendarEvent(
+                user_id=user_id,
+                title=e.get('title', 'Untitled Event'),
+                description=e.get('description', ''),
+                start_time=_parse_datetime(e['start_time'], user_tz),
+                end_time=_parse_datetime(e['end_time'], user_tz),
+            ))
+        # ValueError: bad format; KeyError: unknown timezone (ZoneInfoNotFoundError);
+        # TypeError: a non-string datetime value.
+        except (ValueError, KeyError, TypeError) as exc:
+            failures.append(f"#{index} ('{e.get('title', 'Untitled Event')}'): {type(exc).__name__}: {exc}")
+
+    created = []
+    if new_events:
+        with transaction.atomic():
+            created = CalendarEvent.objects.bulk_create(new_events, batch_size=500)
+            # bulk_create sends no post_save, so keep the counter in step here.
+            adjust_calendar_events_count(user_id, len(created))
+
+    parts = []
+    if created:
+        summary = ", ".join(f"'{e.title}' (ID: {e.id})" for e in created)
+        parts.append(f"Successfully added {len(created)} events: {summary}.")
+    if failures:
+        parts.append(
+            f"Error: {len(failures)} events could not be added "
+            f"(expected format 'YYYY-MM-DD HH:MM:SS'): " + "; ".join(failures) + "."
+        )
+    return " ".join(parts)
+
+def _list_events(user_id):
+    now_utc = datetime.now(timezone.utc)
+    # Materialize once (no separate exists() query) as plain tuples of the
+    # formatted columns; no model instances are built.
+    events = list(
+        CalendarEvent.objects
+        .filter(user_id=user_id, end_time__gte=now_utc)
+        .order_by('start_time')
+        .values_list('id', 'title', 'start_time')[:10]
+    )
+    if not events:
         return "No upcoming events found in the calendar."
     
     event_list = [
-        f"ID: {e.id}, Title: '{e.title}', Start: {e.start_time.isoformat()}"
-        for e in events
+        f"ID: {event_id}, Title: '{title}', Start: {start_time.isoformat()}"
+        for event_id, title, start_time in events
     ]
     return "Upcoming events:\n" + "\n".join(event_list)
 
-def _update_event(user, event_id, updates):
+def _apply_updates(event, updates, user_tz_str):
+    """Sets the supported fields from `updates` on `event`; returns their names."""
+    updated_fields = []
+    if 'title' in updates:
+        event.title = updates['title']
+        updated_fields.append('title')
+    if 'description' in updates:
+        event.description = updates['description']
+        updated_fields.append('description')
+    if 'start_time' in updates:
+        event.start_time = _parse_datetime(updates['start_time'], user_tz_str)
+        updated_fields.append('start_time')
+    if 'end_time' in updates:
+        event.end_time = _parse_datetime(updates['end_time'], user_tz_str)
+        updated_fields.append('end_time')
+    return updated_fields
+
+def _update_event(user_id, user_tz, event_id, updates):
     try:
-        event = CalendarEvent.objects.get(pk=event_id, user=user)
-        updated_fields = []
-        if 'title' in updates:
-            event.title = updates['title']
-            updated_fields.append('title')
-        if 'description' in updates:
-            event.description = updates['description']
-            updated_fields.append('description')
-        
-        user_tz_str = user.timezone
-        if 'start_time' in updates:
-            event.start_time = _parse_datetime(updates['start_time'], user_tz_str)
-            updated_fields.append('start_time')
-        if 'end_time' in updates:
-            event.end_time = _parse_datetime(updates['end_time'], user_tz_str)
-            updated_fields.append('end_time')
+        event = CalendarEvent.objects.get(pk=event_id, user_id=user_id)
+        updated_fields = _apply_updates(event, updates, user_tz)
             
         if updated_fields:
-            event.save()
+            # Only write the changed columns (auto_now needs updated_at listed explicitly).
+            event.save(update_fields=updated_fields + ['updated_at'])
             return f"Successfully updated fields {updated_fields} for event ID {event_id}."
         return "No valid fields provided to update."
 
@@ -65,9 +121,30 @@ def _update_event(user, event_id, updates):
     except Exception as e:
         return f"Error updating event: {str(e)}"
 
-def _delete_event(user, event_id):
+def _update_events_bulk(user_id, user_tz, changes):
+    # One SELECT for all targeted events, one bulk UPDATE for all changes.
+    event_ids = [int(c['event_id']) for c in changes]
+    events_by_id = CalendarEvent.objects.filter(user_id=user_id).in_bulk(event_ids)
+    missing = [event_id for event_id in event_ids if event_id not in events_by_id]
+    if missing:
+        return f"Error: Events with IDs {missing} not found. No events were updated."
+
+    fields = set()
+    now = django_timezone.now()
+    for event_id, change in zip(event_ids, changes):
+        event = events_by_id[event_id]
+        fields.update(_apply_updates(event, change.get('updates') or {}, user_tz))
+        event.updated_at = now # bulk_update() does not apply auto_now
+    if not fields:
+        return "No valid fields provided to update."
+
+    with transaction.atomic():
+        CalendarEvent.objects.bulk_update(events_by_id.values(), fields=[*fields, 'updated_at'], batch_size=500)
+    return f"Successfully updated {len(events_by_id)} events (fields: {sorted(fields)})."
+
+def _delete_event(user_id, event_id):
     try:
-        event = CalendarEvent.objects.get(pk=event_id, user=user)
+        event = CalendarEvent.objects.get(pk=event_id, user_id=user_id)
         title = event.title
         event.delete()
         return f"Successfully deleted event '{title}' (ID: {event_id})."
@@ -79,9 +156,9 @@ def manage_calendar(action: str, user_id: int, **kwargs):
     """
     Manages the user's calendar. This is a SYNCHRONOUS function.
     """
-    try:
-        user = User.objects.get(pk=user_id)
-    except User.DoesNotExist:
+    # Only the timezone is needed; events are filtered and created by user_id.
+    user_tz = User.objects.filter(pk=user_id).values_list('timezone', flat=True).first()
+    if user_tz is None:
         return "Error: User not found."
 
     if action == 'add':
@@ -91,27 +168,44 @@ def manage_calendar(action: str, user_id: int, **kwargs):
             return "Error: 'start_time' and 'end_time' are required for adding an event."
         
         try:
-            start_time_utc = _parse_datetime(start_time_str, user.timezone)
-            end_time_utc = _parse_datetime(end_time_str, user.timezone)
-            return _add_event(user, kwargs.get('title', 'Untitled Event'), kwargs.get('description', ''), start_time_utc, end_time_utc)
+            start_time_utc = _parse_datetime(start_time_str, user_tz)
+            end_time_utc = _parse_datetime(end_time_str, user_tz)
+            return _add_event(user_id, kwargs.get('title', 'Untitled Event'), kwargs.get('description', ''), start_time_utc, end_time_utc)
         except Exception as e:
             return f"Error parsing date/time: {e}. Expected format 'YYYY-MM-DD HH:MM:SS'."
             
+    elif action == 'add_bulk':
+        events = kwargs.get('events')
+        if not isinstance(events, list) or not events:
+            return "Error: a non-empty 'events' list is required for 'add_bulk'."
+        return _add_events_bulk(user_id, user_tz, events)
+
     elif action == 'list':
-        return _list_events(user)
+        return _list_events(user_id)
         
     elif action == 'update':
         event_id = kwargs.get('event_id')
         updates = kwargs.get('updates')
         if not event_id or not isinstance(updates, dict):
             return "Error: 'event_id' and an 'updates' dictionary are required for updating an event."
-        return _update_event(user, event_id, updates)
+        return _update_event(user_id, user_tz, event_id, updates)
+
+    elif action == 'update_bulk':
+        changes = kwargs.get('events')
+        if not isinstance(changes, list) or not changes or not all(
+            isinstance(c, dict) and c.get('event_id') and isinstance(c.get('updates'), dict) for c in changes
+        ):
+            return "Error: 'events' must be a list of {'event_id', 'updates'} objects for 'update_bulk'."
+        try:
+            return _update_events_bulk(user_id, user_tz, changes)
+        except Exception as e:
+            return f"Error updating events: {str(e)}"
 
     elif action == 'delete':
         event_id = kwargs.get('event_id')
         if not event_id:
             return "Error: 'event_id' is required for deleting an event."
-        return _delete_event(user, event_id)
+        return _delete_event(user_id, event_id)
         
     else:
-        return "Error: Invalid action. Must be one of 'add', 'list', 'update', 'delete'."
\ No newline at end of file
+        return "Error: Invalid action. Must be one of 'add', 'add_bulk', 'list', 'update', 'update_bulk', 'delete'."
\ No newline at end of file
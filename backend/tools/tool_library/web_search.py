@@ -1,7 +1,10 @@
 # backend/tools/tool_library/web_search.py
+import atexit
 import httpx
 import logging
+import orjson
 import os
+import time
 from urllib.parse import urlencode
 
 logger = logging.getLogger(__name__)
@@ -9,6 +12,55 @@ logger = logging.getLogger(__name__)
 # The internal URL for the searxng service from within the Docker network
 SEARXNG_INTERNAL_URL = os.environ.get("SEARXNG_URL", "http://searxng:8080")
 
+# Created on first use and reused by every search. The tool executor runs all
+# async tools on one long-lived event loop, so the client (and its pooled
+# connections to searxng) stays bound to a live loop. Creation has no await,
+# so it cannot interleave with another search on that loop and needs no lock.
+_client = None
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=SEARXNG_INTERNAL_URL.rstrip('/'),
+            timeout=15.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+    return _client
+
+def _close_client():
+    """Closes the shared client on the loop it was used on, at process exit."""
+    if _client is not None and not _client.is_closed:
+        from tools.executor import run_coroutine
+        try:
+            run_coroutine(_client.aclose())
+        except Exception as e:
+            logger.warning(f"Could not close the web_search HTTP client cleanly: {e}")
+
+atexit.register(_close_client)
+
+# Short-lived cache of formatted results, keyed by normalized query. The LLM
+# often repeats the same search within a conversation turn or two.
+SEARCH_CACHE_TTL_SECONDS = 60
+SEARCH_CACHE_MAX_ENTRIES = 512
+_search_cache = {} # query -> (expires_at, formatted_result)
+
+def _cache_get(key: str):
+    entry = _search_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, result = entry
+    if expires_at < time.monotonic():
+        del _search_cache[key]
+        return None
+    return result
+
+def _cache_set(key: str, result: str):
+    if len(_search_cache) >= SEARCH_CACHE_MAX_ENTRIES:
+        # Dicts keep insertion order, so this drops the oldest entry.
+        del _search_cache[next(iter(_search_cache))]
+    _search_cache[key] = (time.monotonic() + SEARCH_CACHE_TTL_SECONDS, result)
+
 async def search_web(query: str, **kwargs) -> str: # Renamed from run(params) to match registry
     """
     Executes a web search using the searxng service and returns a
@@ -23,7 +75,12 @@ async def search_web(query: str, **kwargs) -> str: # Renamed from run(params) to
     if not query:
         return "Error: No search query was provided to the web_search tool."
 
-    search_url = f"{SEARXNG_INTERNAL_URL.rstrip('/')}/search"
+    cache_key = " ".join(query.lower().split())
+    cached_result = _cache_get(cache_key)
+    if cached_result is not None:
+        logger.info(f"web_search cache hit for query: '{query}'")
+        return cached_result
+
     search_params = {
         "q": query,
         "format": "json",
@@ -34,34 +91,34 @@ async def search_web(query: str, **kwargs) -> str: # Renamed from run(params) to
     logger.info(f"Executing web_search tool with query: '{query}'")
 
     try:
-        # Use an async client to make the request non-blocking
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.get(search_url, params=search_params)
-            
-            # Check for HTTP errors
-            response.raise_for_status()
-            
-            data = response.json()
-
-        results = data.get("results", [])
-        if not results:
+        # Use the shared async client so connections are kept alive between searches
+        response = await _get_client().get("/search", params=search_params)
+        
+        # Check for HTTP errors
+        response.raise_for_status()
+        
+        # Parse the raw bytes directly: no charset detection or str copy.
+        data = orjson.loads(response.content)
+
+        # Only the top 5 results are ever used; slice before touching any of them.
+        top_results = (data.get("results") or [])[:5]
+        if not top_results:
             logger.warning(f"web_search for '{query}' returned no results.")
             return "No results found for the query."
 
-        # Format the top 5 results into a clean string for the LLM
-        snippets = []
-        for r in results[:5]:
-            title = r.get('title', 'No Title')
-            content = r.get('content', 'No Snippet Available').strip()
-            url = r.get('url', '#')
-            # Create a compact, readable block for each result
-            snippets.append(f"Title: {title}\nURL: {url}\nSnippet: {content}")
-        
-        # Join the blocks with a clear separator
-        return "\n\n---\n\n".join(snippets)
+        # Format the top results into compact, readable blocks for the LLM,
+        # joined with a clear separator
+        formatted_results = "\n\n---\n\n".join(
+            f"Title: {r.get('title', 'No Title')}\n"
+            f"URL: {r.get('url', '#')}\n"
+            f"Snippet: {r.get('content', 'No Snippet Available').strip()}"
+            for r in top_results
+        )
+        _cache_set(cache_key, formatted_results)
+        return formatted_results
 
     except httpx.HTTPStatusError as e:
-        logger.error(f"web_search failed with HTTP status {e.response.status_code} for query '{query}'. Response: {e.response.text[:200]}")
+        logger.error(f"web_search failed with HTTP status {e.response.status_code} for query '{query}'. Response: {e.response.content[:200].decode('utf-8', errors='replace')}")
         return f"Error: The web search service returned an HTTP error ({e.response.status_code})."
     except httpx.RequestError as e:
         logger.error(f"Could not connect to the search service for query '{query}': {e}")
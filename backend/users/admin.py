@@ -2,8 +2,13 @@
 
 from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.auth.forms import AdminPasswordChangeForm
+from django.db import transaction
+from django.db.models import JSONField, Value
+from django.db.models.expressions import RawSQL
 from django.utils.html import format_html
-import json
+import itertools
+import orjson
 from .models import User, get_default_user_state, CalendarEvent # <-- IMPORT CalendarEvent
 
 # --- NEW: Admin configuration for CalendarEvent model ---
@@ -24,11 +29,27 @@ class CalendarEventAdmin(admin.ModelAdmin):
 
 
     
+# reset_user_state switches to batched pk__in updates above this many rows.
+RESET_STATE_SINGLE_UPDATE_LIMIT = 50000
+RESET_STATE_BATCH_SIZE = 10000
+
+# Serialized once; compared against user_state as a jsonb value in Postgres.
+DEFAULT_USER_STATE_JSON = orjson.dumps(get_default_user_state()).decode()
+
+class UserPasswordChangeForm(AdminPasswordChangeForm):
+    def save(self, commit=True):
+        user = super().save(commit=False)
+        if commit:
+            user.save(update_fields=['password'])
+        return user
+
+
 # To display the custom 'user_state' field in the admin.
 class UserAdmin(BaseUserAdmin):
     
     # --- NEW: Define the custom admin action ---
     actions = ['reset_user_state']
+    change_password_form = UserPasswordChangeForm
 
     # --- UPDATED: Show both the editable field and the pretty display ---
     fieldsets = BaseUserAdmin.fieldsets + (
@@ -42,21 +63,42 @@ class UserAdmin(BaseUserAdmin):
     readonly_fields = BaseUserAdmin.readonly_fields + ('user_state_display',)
     
     list_display = BaseUserAdmin.list_display + ('user_state_summary',)
+    list_per_page = 25
+    list_max_show_all = 100
+    show_full_result_count = False # Skip the unfiltered COUNT(*) when a filter is applied
+
+    def get_queryset(self, request):
+        # The changelist summary only needs two facts about each user; compute
+        # them in Postgres and leave the user_state blob in the database.
+        qs = super().get_queryset(request)
+        return qs.annotate(
+            _state_is_empty=RawSQL("user_state IS NULL OR user_state = '{}'::jsonb", []),
+            _state_is_default=RawSQL("user_state = %s::jsonb", [DEFAULT_USER_STATE_JSON]),
+        ).defer('user_state')
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        # Write only the edited columns so the F()-maintained
+        # calendar_events_count is never overwritten from the form's snapshot.
+        concrete = {f.name for f in obj._meta.concrete_fields}
+        update_fields = [name for name in form.changed_data if name in concrete]
+        if update_fields:
+            obj.save(update_fields=update_fields)
 
     def user_state_summary(self, obj):
-        # Your existing summary function is great, no changes needed.
-        if isinstance(obj.user_state, dict) and obj.user_state:
-            default_state = get_default_user_state()
-            if obj.user_state == default_state:
-                return "Default"
-            return f"Custom ({len(obj.user_state['calendar_events'])} events)"
-        return "Empty"
+        if obj._state_is_empty:
+            return "Empty"
+        if obj._state_is_default:
+            return "Default"
+        return f"Custom ({obj.calendar_events_count} events)"
     user_state_summary.short_description = 'User State'
 
     def user_state_display(self, obj):
         """Creates a pretty-printed, read-only view of the JSON state."""
         if obj.user_state:
-            formatted_json = json.dumps(obj.user_state, indent=2)
+            # orjson keeps non-ASCII text readable instead of \u-escaping it.
+            formatted_json = orjson.dumps(obj.user_state, option=orjson.OPT_INDENT_2).decode()
             return format_html("<pre>{}</pre>", formatted_json)
         return "State is empty."
     user_state_display.short_description = 'Formatted User State (Read-Only)'
@@ -67,10 +109,20 @@ class UserAdmin(BaseUserAdmin):
         """
         This action resets the user_state JSONField to its default value.
         """
-        default_state = get_default_user_state()
+        default_state = Value(get_default_user_state(), output_field=JSONField())
         
-        # Use update() for efficiency on a large number of objects
-        rows_updated = queryset.update(user_state=default_state)
+        # A single UPDATE with the default as one JSONB literal; no rows are
+        # fetched, so existing state blobs never leave the database.
+        with transaction.atomic():
+            if queryset.count() <= RESET_STATE_SINGLE_UPDATE_LIMIT:
+                rows_updated = queryset.update(user_state=default_state)
+            else:
+                # Very large selections: stream only the primary keys through a
+                # server-side cursor and update them in bounded pk__in batches.
+                rows_updated = 0
+                pks = queryset.order_by().values_list('pk', flat=True).iterator(chunk_size=RESET_STATE_BATCH_SIZE)
+                for batch in itertools.batched(pks, RESET_STATE_BATCH_SIZE):
+                    rows_updated += User.objects.filter(pk__in=batch).update(user_state=default_state)
         
         # Send a success message to the admin user
         self.message_user(request, f"{rows_updated} user(s) had their state successfully reset to default.", messages.SUCCESS)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-16 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_calendarevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(fields=['user', 'end_time', 'start_time'], name='cal_user_end_start_idx'),
+        ),
+    ]
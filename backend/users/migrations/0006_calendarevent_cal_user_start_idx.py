@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-16 12:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_calendarevent_cal_user_end_start_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(fields=['user', 'start_time'], name='cal_user_start_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-16 13:20
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_calendarevent_cal_user_start_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['user_state'], name='user_state_gin'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_user_user_state_gin'),
+    ]
+
+    # Only affects values written after the change; existing TOASTed rows keep
+    # pglz until they are rewritten (e.g. VACUUM FULL users_user).
+    operations = [
+        migrations.RunSQL(
+            sql='ALTER TABLE users_user ALTER COLUMN user_state SET COMPRESSION lz4;',
+            reverse_sql='ALTER TABLE users_user ALTER COLUMN user_state SET COMPRESSION default;',
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_calendar_events_count(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    CalendarEvent = apps.get_model('users', 'CalendarEvent')
+    counts = (
+        CalendarEvent.objects.filter(user=OuterRef('pk'))
+        .order_by().values('user').annotate(c=Count('pk')).values('c')
+    )
+    User.objects.update(calendar_events_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_user_state_lz4_compression'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='calendar_events_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_calendar_events_count, migrations.RunPython.noop),
+    ]
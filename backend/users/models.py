@@ -1,19 +1,27 @@
+import copy
+from functools import cached_property
+
+import orjson
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.conf import settings
 
 User = settings.AUTH_USER_MODEL
 
+_DEFAULT_USER_STATE = {
+    "alias": "",
+    "preferences": {
+        "communication_style": "neutral"
+    },
+    # "calendar_events": [], # <-- REMOVED. This is now a dedicated model.
+    "tasks": [],
+}
+
 def get_default_user_state():
     """Returns the default JSON structure for a new user's state."""
-    return {
-        "alias": "",
-        "preferences": {
-            "communication_style": "neutral"
-        },
-        # "calendar_events": [], # <-- REMOVED. This is now a dedicated model.
-        "tasks": [],
-    }
+    # A fresh copy each call: JSONField defaults must never share a mutable object.
+    return copy.deepcopy(_DEFAULT_USER_STATE)
 
 class User(AbstractUser):
     """
@@ -31,10 +39,30 @@ class User(AbstractUser):
         default='UTC',
         help_text="The user's IANA timezone name (e.g., 'America/New_York')."
     )
+    # Denormalized COUNT of calendar_events, kept current by users.signals with
+    # F() updates. Saves of an existing user pass update_fields without it, so a
+    # stale in-memory value is never written back.
+    calendar_events_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Lets Aigent-driven lookups into user_state (containment @>, key ?)
+            # use an index instead of scanning every user.
+            GinIndex(fields=['user_state'], name='user_state_gin'),
+        ]
 
     def __str__(self):
         return self.username
 
+    @cached_property
+    def user_state_json(self):
+        """Compact JSON encoding of user_state for prompt embedding. Reset on save()."""
+        return orjson.dumps(self.user_state if isinstance(self.user_state, dict) else {}).decode()
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.__dict__.pop('user_state_json', None)
+
 # --- NEW MODEL ---
 class CalendarEvent(models.Model):
     """
@@ -51,6 +79,19 @@ class CalendarEvent(models.Model):
 
     class Meta:
         ordering = ['start_time']
+        indexes = [
+            # Upcoming-events lookup: filter by user and end_time, ordered by start_time.
+            models.Index(fields=['user', 'end_time', 'start_time'], name='cal_user_end_start_idx'),
+            # Calendar tab: all of a user's events, paginated by start_time.
+            models.Index(fields=['user', 'start_time'], name='cal_user_start_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so users.signals can move the count when an event changes owner.
+        instance._loaded_user_id = instance.__dict__.get('user_id')
+        return instance
 
     def __str__(self):
         return f"'{self.title}' for {self.user.username} at {self.start_time}"
\ No newline at end of file
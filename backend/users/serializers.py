@@ -1,3 +1,5 @@
+import zoneinfo
+
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
@@ -7,20 +9,67 @@ from .models import CalendarEvent # <-- NEW IMPORT
 User = get_user_model()
 
 
+# Read once at import; validating a timezone is then a set lookup, with no
+# tzdata file access per request.
+VALID_TIMEZONES = frozenset(zoneinfo.available_timezones())
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 'user_state', 'timezone')
+        # Identity fields are not editable through /me/; this also drops the
+        # per-PATCH uniqueness lookup DRF runs for a writable username.
+        read_only_fields = ('id', 'username', 'email')
         extra_kwargs = {
-            'timezone': {'required': False}
+            'user_state': {'required': False},
+            'timezone': {'required': False},
         }
 
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        if validated_data:
+            # Write only the PATCHed columns (never the F()-maintained calendar_events_count).
+            instance.save(update_fields=list(validated_data))
+        return instance
+
+    def validate_timezone(self, value):
+        if value not in VALID_TIMEZONES:
+            raise serializers.ValidationError(f"'{value}' is not a known IANA timezone.")
+        return value
+
+def user_to_dict(user) -> dict:
+    """
+    Read-only equivalent of UserSerializer(user).data for the hot /me/ GET,
+    built without DRF field binding. Keep in step with UserSerializer.Meta.fields.
+    """
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'user_state': user.user_state,
+        'timezone': user.timezone,
+    }
+
 # --- NEW SERIALIZER ---
 class CalendarEventSerializer(serializers.ModelSerializer):
     class Meta:
         model = CalendarEvent
         fields = ('id', 'title', 'description', 'start_time', 'end_time')
 
+    def to_representation(self, instance):
+        # Hand-written to skip DRF's per-row field lookups on list pages.
+        # Datetimes are left as objects; ORJSONRenderer emits them as UTC 'Z' strings.
+        return {
+            'id': instance.id,
+            'title': instance.title,
+            'description': instance.description,
+            'start_time': instance.start_time,
+            'end_time': instance.end_time,
+        }
+
 
 class PasswordChangeSerializer(serializers.Serializer):
     old_password = serializers.CharField(required=True, write_only=True)
@@ -48,5 +97,6 @@ class PasswordChangeSerializer(serializers.Serializer):
         password = self.validated_data['new_password1']
         user = self.context['request'].user
         user.set_password(password)
-        user.save()
+        # Only the hash changed; don't rewrite the rest of the row (user_state JSONB included).
+        user.save(update_fields=['password'])
         return user
\ No newline at end of file
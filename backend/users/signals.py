@@ -0,0 +1,33 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CalendarEvent, User
+
+
+def adjust_calendar_events_count(user_id, delta):
+    """
+    Atomically shifts a user's calendar_events_count by delta in SQL.
+    Also called directly by bulk_create paths, which send no signals.
+    """
+    if delta:
+        User.objects.filter(pk=user_id).update(calendar_events_count=F('calendar_events_count') + delta)
+
+
+@receiver(post_save, sender=CalendarEvent)
+def calendar_event_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        adjust_calendar_events_count(instance.user_id, 1)
+    else:
+        previous_user_id = getattr(instance, '_loaded_user_id', None)
+        if previous_user_id is not None and previous_user_id != instance.user_id:
+            adjust_calendar_events_count(previous_user_id, -1)
+            adjust_calendar_events_count(instance.user_id, 1)
+    instance._loaded_user_id = instance.user_id
+
+
+@receiver(post_delete, sender=CalendarEvent)
+def calendar_event_deleted(sender, instance, **kwargs):
+    adjust_calendar_events_count(instance.user_id, -1)
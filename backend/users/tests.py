@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tools.tool_library.calendar_tool import manage_calendar
+from .models import CalendarEvent
+
+User = get_user_model()
+
+START = datetime(2030, 1, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def make_event(user, title="Event", offset_hours=0):
+    start = START + timedelta(hours=offset_hours)
+    return CalendarEvent.objects.create(user=user, title=title, start_time=start, end_time=start + timedelta(hours=1))
+
+
+class CalendarEventsCountTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="alice", password="pw-alice-123")
+        self.other = User.objects.create_user(username="bob", password="pw-bob-123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertCount(self, user, expected):
+        user.refresh_from_db(fields=['calendar_events_count'])
+        self.assertEqual(user.calendar_events_count, expected)
+        self.assertEqual(user.calendar_events_count, CalendarEvent.objects.filter(user=user).count())
+
+    def test_create_increments(self):
+        make_event(self.user)
+        make_event(self.user, offset_hours=2)
+        self.assertCount(self.user, 2)
+        self.assertCount(self.other, 0)
+
+    def test_update_without_owner_change_keeps_count(self):
+        event = make_event(self.user)
+        event.title = "Renamed"
+        event.save()
+        CalendarEvent.objects.get(pk=event.pk).save()
+        self.assertCount(self.user, 1)
+
+    def test_delete_decrements(self):
+        event = make_event(self.user)
+        make_event(self.user, offset_hours=2)
+        event.delete()
+        self.assertCount(self.user, 1)
+
+    def test_queryset_bulk_delete_decrements(self):
+        for i in range(3):
+            make_event(self.user, offset_hours=i)
+        make_event(self.other)
+        CalendarEvent.objects.filter(user=self.user).delete()
+        self.assertCount(self.user, 0)
+        self.assertCount(self.other, 1)
+
+    def test_bulk_create_endpoint_increments(self):
+        payload = [
+            {"title": f"Bulk {i}", "start_time": (START + timedelta(hours=i)).isoformat(),
+             "end_time": (START + timedelta(hours=i, minutes=30)).isoformat()}
+            for i in range(4)
+        ]
+        response = self.client.post(reverse('calendar_events_bulk_create'), payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertCount(self.user, 4)
+
+    def test_calendar_tool_add_bulk_and_delete(self):
+        events = [{"title": "A", "start_time": "2030-01-01 09:00:00", "end_time": "2030-01-01 10:00:00"},
+                  {"title": "B", "start_time": "2030-01-02 09:00:00", "end_time": "2030-01-02 10:00:00"}]
+        manage_calendar('add_bulk', self.user.id, events=events)
+        self.assertCount(self.user, 2)
+        event_id = CalendarEvent.objects.filter(user=self.user).values_list('id', flat=True).first()
+        manage_calendar('delete', self.user.id, event_id=event_id)
+        self.assertCount(self.user, 1)
+
+    def test_moving_event_to_another_owner(self):
+        event = make_event(self.user)
+        loaded = CalendarEvent.objects.get(pk=event.pk)
+        loaded.user = self.other
+        loaded.save()
+        self.assertCount(self.user, 0)
+        self.assertCount(self.other, 1)
+        # Saving the same instance again must not move the count twice.
+        loaded.save()
+        self.assertCount(self.other, 1)
+
+    def test_moving_freshly_created_event(self):
+        event = make_event(self.user)
+        event.user = self.other
+        event.save()
+        self.assertCount(self.user, 0)
+        self.assertCount(self.other, 1)
+
+    def test_profile_patch_with_stale_user_does_not_overwrite_count(self):
+        # self.user (the authenticated instance) still holds count=0 in memory.
+        make_event(self.user)
+        response = self.client.patch(reverse('me'), {"first_name": "Alice"}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertCount(self.user, 1)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Alice")
+
+    def test_cascade_delete_of_user_removes_events(self):
+        make_event(self.user)
+        self.user.delete()
+        self.assertFalse(CalendarEvent.objects.exists())
+
+
+class BulkCalendarEventCreateViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="dave", password="pw-dave-123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('calendar_events_bulk_create')
+
+    def payload(self, count):
+        return [
+            {"title": f"Event {i}", "description": "", "start_time": (START + timedelta(days=i)).isoformat(),
+             "end_time": (START + timedelta(days=i, hours=1)).isoformat()}
+            for i in range(count)
+        ]
+
+    def test_creates_all_events_for_requesting_user(self):
+        response = self.client.post(self.url, self.payload(3), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item['title'] for item in response.json()], ["Event 0", "Event 1", "Event 2"])
+        self.assertTrue(all(item['id'] for item in response.json()))
+        self.assertEqual(response.json()[0]['start_time'], "2030-01-01T09:00:00Z")
+        self.assertEqual(CalendarEvent.objects.filter(user=self.user).count(), 3)
+
+    def test_invalid_item_rejects_whole_batch(self):
+        payload = self.payload(2)
+        payload[1]['start_time'] = "not a date"
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(CalendarEvent.objects.exists())
+
+    def test_non_list_body_is_rejected(self):
+        response = self.client.post(self.url, self.payload(1)[0], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_requires_authentication(self):
+        response = APIClient().post(self.url, self.payload(1), format='json')
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(CalendarEvent.objects.exists())
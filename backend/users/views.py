@@ -1,9 +1,15 @@
 from rest_framework import generics, permissions, status
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from users.serializers import PasswordChangeSerializer, UserSerializer, CalendarEventSerializer # UPDATE
+from users.serializers import PasswordChangeSerializer, UserSerializer, CalendarEventSerializer, user_to_dict # UPDATE
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
+from django.utils import timezone
+from lba_project.renderers import ORJSONResponse
 from .models import CalendarEvent # UPDATE
+from .signals import adjust_calendar_events_count
 
 User = get_user_model()
 
@@ -12,8 +18,25 @@ class MeView(APIView):
     permission_classes = (permissions.IsAuthenticated,)
 
     def get(self, request, *args, **kwargs):
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data)
+        user = request.user
+        # Fetched on every page load: build the dict directly, no serializer.
+        data = user_to_dict(user)
+
+        # Opt-in (?include=upcoming_events): one extra query for the next events,
+        # with only the columns returned, instead of one per related object.
+        if 'upcoming_events' in request.query_params.get('include', '').split(','):
+            upcoming = (
+                CalendarEvent.objects
+                .filter(end_time__gte=timezone.now())
+                .only('id', 'user_id', 'title', 'start_time', 'end_time')
+                .order_by('start_time')[:CalendarEventPagination.page_size]
+            )
+            prefetch_related_objects([user], Prefetch('calendar_events', queryset=upcoming, to_attr='upcoming_events'))
+            data['upcoming_events'] = [
+                {'id': e.id, 'title': e.title, 'start_time': e.start_time, 'end_time': e.end_time}
+                for e in user.upcoming_events
+            ]
+        return ORJSONResponse(data)
 
     def patch(self, request, *args, **kwargs):
         user = request.user
@@ -24,16 +47,45 @@ class MeView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 # --- NEW VIEW ---
+class CalendarEventPagination(PageNumberPagination):
+    page_size = 50
+
+
 class CalendarEventListView(generics.ListAPIView):
     """
-    API endpoint to list calendar events for the authenticated user.
+    API endpoint to list calendar events for the authenticated user,
+    paginated in start_time order.
     """
     serializer_class = CalendarEventSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CalendarEventPagination
 
     def get_queryset(self):
-        # Only return events belonging to the current user
-        return CalendarEvent.objects.filter(user=self.request.user)
+        # Only return events belonging to the current user, with just the serialized columns
+        return (
+            CalendarEvent.objects
+            .filter(user=self.request.user)
+            .only('id', 'title', 'description', 'start_time', 'end_time')
+            .order_by('start_time')
+        )
+
+
+class BulkCalendarEventCreateView(APIView):
+    """
+    API endpoint to create many calendar events for the authenticated user
+    in one request, written with a single multi-row INSERT.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = CalendarEventSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        events = [CalendarEvent(user=request.user, **item) for item in serializer.validated_data]
+        with transaction.atomic():
+            created = CalendarEvent.objects.bulk_create(events, batch_size=1000)
+            # bulk_create sends no post_save, so keep the counter in step here.
+            adjust_calendar_events_count(request.user.id, len(created))
+        return Response(CalendarEventSerializer(created, many=True).data, status=status.HTTP_201_CREATED)
 
 
 class PasswordChangeView(generics.GenericAPIView):
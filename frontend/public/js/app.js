@@ -14,6 +14,8 @@ let currentUser = {
     timezone: 'UTC'
 };
 let calendarRendered = false; // Flag to check if calendar has been rendered once
+const CHAT_HISTORY_LIMIT = 100; // Newest messages loaded when opening the chat
+let chatHistoryCursor = null; // `next_cursor` of the oldest loaded page; null when nothing older remains
 
 
 // --- THEME MANAGEMENT ---
@@ -132,6 +134,7 @@ async function setupPage() {
         await populateAigentSelector();
         initializeTabs(); // NEW: Set up tab functionality
         loadChatHistory();
+        document.getElementById('loadOlderHistory')?.addEventListener('click', loadOlderChatHistory);
 
         const messageForm = document.getElementById('messageForm');
         if (messageForm) {
@@ -295,7 +298,20 @@ async function renderCalendar() {
     container.innerHTML = '<em>Loading events...</em>'; // Show loading state
 
     try {
-        const events = await apiFetch('/api/v1/calendar/events/');
+        // Paginated response in start_time order: follow `next` until every page is loaded.
+        const events = [];
+        let url = '/api/v1/calendar/events/';
+        while (url) {
+            const page = await apiFetch(url);
+            if (!page) break;
+            events.push(...page.results);
+            url = null;
+            if (page.next) {
+                // `next` is an absolute URL; keep only path and query so it goes through the same origin.
+                const next = new URL(page.next, window.location.origin);
+                url = next.pathname + next.search;
+            }
+        }
         container.innerHTML = ''; // Clear loading state
 
         if (!events || events.length === 0) {
@@ -344,18 +360,50 @@ async function loadChatHistory() {
     const chatMessagesDiv = document.getElementById('chatMessages');
     if (!chatMessagesDiv || !chatWindow) return;
     chatMessagesDiv.innerHTML = '';
+    setChatHistoryCursor(null);
     try {
-        const data = await apiFetch('/api/v1/chat/history/');
+        const data = await apiFetch(`/api/v1/chat/history/?limit=${CHAT_HISTORY_LIMIT}`);
         if (data.history && Array.isArray(data.history)) {
             data.history.forEach(msg => appendMessageToChat(msg.role, msg.content, msg.timestamp, false));
             scrollToBottom(chatWindow);
         }
+        setChatHistoryCursor(data.next_cursor);
     } catch (error) {
         appendMessageToChat('system', `Error loading chat history: ${error.message}`, new Date().toISOString(), true, 'error');
     }
 }
 
-function appendMessageToChat(role, text, timestamp, doScroll = true, type = 'normal') {
+// Shows the "load older" control only while the server reports older messages.
+function setChatHistoryCursor(cursor) {
+    chatHistoryCursor = (cursor === undefined) ? null : cursor;
+    const loadOlderBtn = document.getElementById('loadOlderHistory');
+    if (loadOlderBtn) loadOlderBtn.style.display = chatHistoryCursor === null ? 'none' : 'block';
+}
+
+// Prepends the page of messages before `chatHistoryCursor`, keeping the visible messages in place.
+async function loadOlderChatHistory() {
+    const chatWindow = document.getElementById('chatWindow');
+    const chatMessagesDiv = document.getElementById('chatMessages');
+    const loadOlderBtn = document.getElementById('loadOlderHistory');
+    if (!chatMessagesDiv || !chatWindow || chatHistoryCursor === null) return;
+    if (loadOlderBtn) loadOlderBtn.disabled = true;
+    try {
+        const data = await apiFetch(`/api/v1/chat/history/?limit=${CHAT_HISTORY_LIMIT}&cursor=${chatHistoryCursor}`);
+        if (data.history && Array.isArray(data.history)) {
+            const firstLoaded = chatMessagesDiv.firstChild;
+            const previousHeight = chatWindow.scrollHeight;
+            data.history.forEach(msg => appendMessageToChat(msg.role, msg.content, msg.timestamp, false, 'normal', firstLoaded));
+            chatWindow.scrollTop += chatWindow.scrollHeight - previousHeight;
+        }
+        setChatHistoryCursor(data.next_cursor);
+    } catch (error) {
+        appendMessageToChat('system', `Error loading older messages: ${error.message}`, new Date().toISOString(), true, 'error');
+    } finally {
+        if (loadOlderBtn) loadOlderBtn.disabled = false;
+    }
+}
+
+function appendMessageToChat(role, text, timestamp, doScroll = true, type = 'normal', insertBefore = null) {
     const chatWindow = document.getElementById('chatWindow');
     const chatMessagesDiv = document.getElementById('chatMessages');
     if (!chatMessagesDiv || !chatWindow) return;
@@ -406,7 +454,8 @@ function appendMessageToChat(role, text, timestamp, doScroll = true, type = 'nor
         messageWrapper.appendChild(contentDiv);
     }
     
-    chatMessagesDiv.appendChild(messageWrapper);
+    // insertBefore (a message node, or null to append) lets older history pages be prepended in order.
+    chatMessagesDiv.insertBefore(messageWrapper, insertBefore);
     if (doScroll) {
         setTimeout(() => scrollToBottom(chatWindow), 50);
     }
@@ -426,7 +475,7 @@ async function sendMessageToAigent(messageText, userId) { // Pass user ID
             body: JSON.stringify({ message: messageText })
         });
         if (taskData && taskData.task_id) {
-            pollTaskStatus(taskData.task_id, userId); // Pass user ID to poller
+            waitForTaskResult(taskData.task_id, userId); // Pass user ID to poller
         } else {
             throw new Error("No task_id received from the server.");
         }
@@ -436,6 +485,32 @@ async function sendMessageToAigent(messageText, userId) { // Pass user ID
     }
 }
 
+// Waits for the server to push the task's final status over Server-Sent Events,
+// then renders it with a single status fetch. Falls back to regular polling if
+// the stream is unavailable or ends without a result.
+async function waitForTaskResult(taskId, userId) {
+    try {
+        const response = await fetch(`/api/v1/chat/task_events/${taskId}/`, {
+            headers: { 'Authorization': `Bearer ${localStorage.getItem('accessToken')}` }
+        });
+        if (response.ok && response.body) {
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            // Keepalive comments start with ':'; the final status arrives as a 'data:' event.
+            while (!buffer.includes('data:')) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+            }
+            reader.cancel();
+        }
+    } catch (error) {
+        console.warn('Task event stream unavailable, falling back to polling:', error.message);
+    }
+    pollTaskStatus(taskId, userId);
+}
+
 async function pollTaskStatus(taskId, userId, retries = 20, interval = 3000) { // Receive userId
     const typingIndicator = document.getElementById('typingIndicator');
     try {